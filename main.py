@@ -14,32 +14,28 @@ Zeron v1.0.0 (State of the Art Edition)
 import sys
 import os
 import json
+import re
 import platform
-import traceback
+import time
+import copy
+import shutil
+import pickle
+import hashlib
+import threading
 import base64
-from functools import partial
-from datetime import datetime
-from urllib.parse import urlparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from urllib.parse import quote_plus
 
-from PyQt5.QtCore import (
-    Qt, QUrl, QPropertyAnimation, QEasingCurve, QRect, QTimer, QPoint, QEvent,
-    QParallelAnimationGroup, QSequentialAnimationGroup, QSize, QObject, pyqtSignal
-)
-from PyQt5.QtGui import (
-    QMovie, QColor, QKeySequence, QPixmap, QIcon, QFont, QPalette, QBrush,
-    QPainter, QLinearGradient, QPen
-)
+from PyQt5.QtCore import Qt, QUrl, QTimer, QThread
+from PyQt5.QtGui import QColor, QKeySequence, QFont, QPalette
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QToolBar, QAction, QLineEdit, QPushButton,
-    QVBoxLayout, QWidget, QLabel, QHBoxLayout, QScrollArea, QSizePolicy,
-    QDialog, QProgressBar, QMessageBox, QInputDialog, QFileDialog, QTabWidget,
-    QGraphicsDropShadowEffect, QGraphicsOpacityEffect, QListWidget, QListWidgetItem,
-    QSplitter, QFrame, QShortcut
-)
-from PyQt5.QtWebEngineWidgets import (
-    QWebEngineView, QWebEngineProfile, QWebEnginePage,
-    QWebEngineSettings, QWebEngineDownloadItem
+    QVBoxLayout, QWidget, QDialog, QProgressBar, QMessageBox, QTabWidget,
+    QListWidget, QListWidgetItem, QSplitter
 )
+from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineProfile
 from PyQt5.QtWebEngineCore import QWebEngineUrlRequestInterceptor
 
 # ------------------ Configuration & Constants ------------------
@@ -56,7 +52,8 @@ DOWNLOADS_DIR = os.path.join(BASE_DIR, "Downloads")
 LOADING_GIF_LOCAL = os.path.join(BASE_DIR, "cat-cat-dance.gif")
 
 BOOKMARKS_FILE = os.path.join(DATA_DIR, "bookmarks.json")
-HISTORY_FILE   = os.path.join(DATA_DIR, "history.json")
+HISTORY_FILE   = os.path.join(DATA_DIR, "history.jsonl")
+HISTORY_SNAPSHOT = HISTORY_FILE + ".pkl"
 SETTINGS_FILE  = os.path.join(DATA_DIR, "settings.json")
 SESSION_FILE   = os.path.join(DATA_DIR, "last_session.json")
 
@@ -68,18 +65,53 @@ DEFAULT_SETTINGS = {
     "home_page": "zeron://speeddial",
     "show_bookmark_bar": True,
     "vertical_tabs": False,
-    "adblock_enabled": True
+    "adblock_enabled": True,
+    "http_cache_mb": 256,
+    "http_cache_type": "disk",  # "memory" keeps nothing on slow disks
+    "history_max": 10000
 }
 
-# Try importing keyring for vault
+SEARCH_URL = "https://www.google.com/search?q="
+SCHEME_RE = re.compile(r"^[a-z][a-z0-9+.-]*://", re.I)
+
+# (action name, key sequence, ZeronMain slot)
+SHORTCUT_SPECS = [
+    ("New Tab", "Ctrl+T", "add_new_tab"),
+    ("Close Tab", "Ctrl+W", "close_current_tab"),
+    ("Reload", "Ctrl+R", "reload_page"),
+    ("Focus Address Bar", "Ctrl+L", "focus_url_bar"),
+    ("Command Palette", "Ctrl+Shift+P", "show_command_palette"),
+    ("Toggle Fullscreen", "F11", "toggle_fullscreen")
+]
+
+# Prefer orjson for data files, fall back to stdlib json. The backend is
+# picked once here so the helpers below never branch on it.
 try:
-    import keyring
-    KEYRING_AVAILABLE = True
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(data, indent=False):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
 except ImportError:
-    KEYRING_AVAILABLE = False
+    _json_loads = json.loads
+
+    def _json_dumps(data, indent=False):
+        return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+# Fuzzy matching for the command palette
+try:
+    from rapidfuzz import process, fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
 
 # ------------------ AdBlock Engine ------------------
 
+@lru_cache(maxsize=4096)
+def _is_blocked_host(host, suffixes):
+    # Pure function of its arguments; safe to call from the WebEngine IO thread
+    return ("." + host).endswith(suffixes)
+
 class AdBlockInterceptor(QWebEngineUrlRequestInterceptor):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -88,38 +120,288 @@ class AdBlockInterceptor(QWebEngineUrlRequestInterceptor):
             "adservice.google.com", "adnxs.com", "ads.yahoo.com",
             "criteo.com", "outbrain.com", "taboola.com", "rubiconproject.com"
         }
+        # ".domain" suffixes match the domain itself and its subdomains
+        self._blocked_suffixes = tuple("." + d for d in self.blocked_domains)
 
     def interceptRequest(self, info):
-        url = info.requestUrl().toString()
-        host = urlparse(url).hostname
-        if host:
-            for bad in self.blocked_domains:
-                if bad in host:
-                    info.block(True)
-                    # print(f"Blocked Ad: {url}")
-                    return
+        # QUrl is already parsed on the C++ side; no need to stringify and re-parse
+        host = info.requestUrl().host()
+        if host and _is_blocked_host(host, self._blocked_suffixes):
+            info.block(True)
 
 # ------------------ Helpers ------------------
 
 def load_json(path, default):
     try:
         if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(path, "rb") as f:
+                raw = f.read()
+            return _json_loads(raw)
     except Exception:
         pass
     return default
 
-def save_json(path, data):
+def write_bytes(path, payload):
+    # Write to a sibling temp file and swap it in, so a crash mid-write
+    # never leaves a truncated file behind. The temp name is unique per
+    # process so two running instances cannot clobber each other's write.
+    tmp = f"{path}.tmp.{os.getpid()}"
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        with open(tmp, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+
+def load_ndjson(path, limit=None):
+    # With a limit only the last `limit` lines are kept and parsed. A torn
+    # line (e.g. from a crash mid-append) is skipped, not fatal.
+    records = []
+    try:
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                lines = deque(f, maxlen=limit) if limit is not None else f
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    try:
+                        records.append(_json_loads(line))
+                    except Exception:
+                        pass
+    except Exception:
+        pass
+    return records
+
+def append_ndjson(path, records):
+    # One line per record: appending never rewrites what is already on disk
+    try:
+        payload = b"".join(_json_dumps(r) + b"\n" for r in records)
+        with open(path, "ab+") as f:
+            # Terminate a torn last line so it does not swallow this batch
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    payload = b"\n" + payload
+            f.write(payload)
     except Exception:
         pass
 
+def load_history(limit):
+    # The pickle is a cache of the JSONL log written at exit. It is only
+    # trusted when nothing was appended to the log after it was written.
+    try:
+        if os.stat(HISTORY_SNAPSHOT).st_mtime >= os.stat(HISTORY_FILE).st_mtime:
+            with open(HISTORY_SNAPSHOT, "rb") as f:
+                return pickle.load(f)[-limit:]
+    except Exception:
+        pass
+    return load_ndjson(HISTORY_FILE, limit=limit)
+
+def compact_history(limit):
+    # Runs on the writer thread at exit. Everything is rebuilt from the log
+    # on disk, not from this process's HISTORY, so entries appended by
+    # another running instance survive. Once the log holds more than twice
+    # `limit` lines it is rewritten with just the newest `limit` records.
+    # The snapshot is written last so it is never older than the log.
+    try:
+        with open(HISTORY_FILE, "rb") as f:
+            lines = sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+    except OSError:
+        return
+    entries = load_ndjson(HISTORY_FILE, limit=limit)
+    if lines > 2 * limit:
+        write_bytes(HISTORY_FILE, b"".join(_json_dumps(r) + b"\n" for r in entries))
+    write_bytes(HISTORY_SNAPSHOT, pickle.dumps(entries, pickle.HIGHEST_PROTOCOL))
+
+def dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def prepare_http_cache(path, limit):
+    # An oversized cache index is parsed synchronously by Chromium on first
+    # load. The size check runs on a background thread and only leaves a
+    # marker; the next start moves the flagged cache aside before WebEngine
+    # opens it, and the old copy is deleted in the background.
+    marker = path + ".purge"
+    stale = path + ".stale"
+    if os.path.exists(marker) and not os.path.exists(stale):
+        try:
+            os.rename(path, stale)
+            os.remove(marker)
+        except OSError:
+            pass
+
+    def check():
+        shutil.rmtree(stale, ignore_errors=True)
+        # 0 means Qt picks the size itself, so there is no cap to compare to
+        if limit > 0 and dir_size(path) > 2 * limit:
+            try:
+                open(marker, "wb").close()
+            except OSError:
+                pass
+
+    threading.Thread(target=check, daemon=True).start()
+
+def remove_legacy_http_cache():
+    # Earlier versions pointed the cache path at zeron_data/cache too, and
+    # QtWebEngine kept the HTTP cache in its "Cache" subdirectory. Only that
+    # subdirectory is removed; cookies and local storage live beside it.
+    legacy = os.path.join(DATA_DIR, "cache", "Cache")
+    if os.path.isdir(legacy):
+        threading.Thread(target=shutil.rmtree, args=(legacy, True), daemon=True).start()
+
+class JsonWriter(QThread):
+    # Serializes and writes data files off the UI thread. Paths marked dirty
+    # within `delay` seconds of each other are written once, and a file is
+    # skipped when its contents hash to what was last written.
+    def __init__(self, delay=0.5, parent=None):
+        super().__init__(parent)
+        self.delay = delay
+        self._dirty = {}
+        self._jobs = []
+        self._last_written = {}
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    def mark_dirty(self, path, data):
+        # Snapshot so the UI thread can keep mutating the original
+        with self._lock:
+            self._dirty[path] = copy.copy(data)
+        self._wake.set()
+
+    def queue_job(self, func):
+        # Runs on the writer thread after the next batch of file writes
+        with self._lock:
+            self._jobs.append(func)
+        self._wake.set()
+
+    def run(self):
+        while not self._stopping.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            # Let a burst of changes settle; returns early on stop()
+            self._stopping.wait(self.delay)
+            self.flush_sync()
+
+    def flush_sync(self):
+        with self._io_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, {}
+                jobs, self._jobs = self._jobs, []
+            pending = []
+            for path, data in dirty.items():
+                try:
+                    payload = _json_dumps(data, indent=True)
+                except Exception:
+                    continue
+                digest = hashlib.blake2b(payload, digest_size=16).digest()
+                if self._last_written.get(path) != digest:
+                    pending.append((path, payload, digest))
+            if len(pending) > 1:
+                # Overlap the fsyncs of several files, e.g. on exit
+                with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+                    results = list(pool.map(lambda p: write_bytes(p[0], p[1]), pending))
+            else:
+                results = [write_bytes(path, payload) for path, payload, _ in pending]
+            for (path, _, digest), ok in zip(pending, results):
+                if ok:
+                    self._last_written[path] = digest
+            for job in jobs:
+                try:
+                    job()
+                except Exception:
+                    pass
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+        self.wait()
+        self.flush_sync()
+
+def int_setting(key, minimum=0):
+    # settings.json is hand-editable: coerce to int, clamp to `minimum` and
+    # fall back to the default when the value is not a number at all
+    try:
+        return max(int(SETTINGS.get(key, DEFAULT_SETTINGS[key])), minimum)
+    except (TypeError, ValueError, OverflowError):
+        return DEFAULT_SETTINGS[key]
+
 BOOKMARKS = load_json(BOOKMARKS_FILE, [])
-HISTORY = load_json(HISTORY_FILE, [])
 SETTINGS = load_json(SETTINGS_FILE, DEFAULT_SETTINGS.copy())
+# Bounded in memory: old entries fall off the left end in O(1)
+HISTORY_MAX = int_setting("history_max", minimum=1)
+HISTORY = deque(load_history(HISTORY_MAX), maxlen=HISTORY_MAX)
+
+# ------------------ Stylesheets ------------------
+
+# Installed once on QApplication in main(); widgets opt in via objectName
+APP_QSS = """
+    QToolBar#glass_toolbar {
+        background: rgba(30, 35, 50, 0.85);
+        border-bottom: 1px solid rgba(255, 255, 255, 0.08);
+        spacing: 6px;
+    }
+    QDialog#command_palette {
+        background-color: #1e222d;
+        border: 1px solid #333;
+        border-radius: 8px;
+    }
+    QDialog#command_palette QLineEdit {
+        background: #2a3040;
+        color: white;
+        border: none;
+        padding: 10px;
+        font-size: 14px;
+        border-radius: 4px;
+    }
+    QDialog#command_palette QListWidget {
+        background: transparent;
+        border: none;
+        color: #ddd;
+        font-size: 13px;
+    }
+    QDialog#command_palette QListWidget::item {
+        padding: 8px;
+        border-radius: 4px;
+    }
+    QDialog#command_palette QListWidget::item:selected {
+        background: #2cabf1;
+        color: white;
+    }
+"""
+
+def _modern_btn_qss(bg, fg, border, hover):
+    return f"""
+        QPushButton {{
+            background-color: {bg};
+            color: {fg};
+            border: {border};
+            border-radius: 6px;
+            padding: 6px 12px;
+        }}
+        QPushButton:hover {{
+            background-color: {hover};
+            color: white;
+        }}
+    """
+
+MODERN_BTN_QSS_ACCENT = _modern_btn_qss("#2cabf1", "white", "none", "#42d7fa")
+MODERN_BTN_QSS_NORMAL = _modern_btn_qss("transparent", "#b0b8c5", "1px solid #3a4050", "#2a3040")
 
 # ------------------ UI Components ------------------
 
@@ -130,13 +412,6 @@ class GlassToolBar(QToolBar):
         self.setFloatable(False)
         self.setObjectName("glass_toolbar")
         self.setContentsMargins(4, 4, 4, 4)
-        self.setStyleSheet("""
-            QToolBar#glass_toolbar {
-                background: rgba(30, 35, 50, 0.85);
-                border-bottom: 1px solid rgba(255, 255, 255, 0.08);
-                spacing: 6px;
-            }
-        """)
 
 class ModernButton(QPushButton):
     def __init__(self, text="", icon=None, parent=None, accent=False):
@@ -148,24 +423,12 @@ class ModernButton(QPushButton):
         self.update_style()
         
     def update_style(self):
-        bg = "#2cabf1" if self.accent else "transparent"
-        fg = "white" if self.accent else "#b0b8c5"
-        border = "none" if self.accent else "1px solid #3a4050"
-        hover = "#42d7fa" if self.accent else "#2a3040"
-        
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {bg};
-                color: {fg};
-                border: {border};
-                border-radius: 6px;
-                padding: 6px 12px;
-            }}
-            QPushButton:hover {{
-                background-color: {hover};
-                color: white;
-            }}
-        """)
+        self.setStyleSheet(MODERN_BTN_QSS_ACCENT if self.accent else MODERN_BTN_QSS_NORMAL)
+
+@lru_cache(maxsize=128)
+def _subsequence_pattern(query):
+    # "tgfs" matches "toggle fullscreen": query chars in order, gaps allowed
+    return re.compile(".*?".join(map(re.escape, query)))
 
 class CommandPalette(QDialog):
     def __init__(self, parent=None, actions_map=None):
@@ -173,42 +436,22 @@ class CommandPalette(QDialog):
         self.setWindowFlags(Qt.Popup | Qt.FramelessWindowHint)
         self.setFixedSize(600, 400)
         self.actions_map = actions_map or {}
+        self._normalized = [(name.lower(), name) for name in self.actions_map]
+        self._choices = [low for low, _ in self._normalized]
+        self._items = []
         
+        self.setObjectName("command_palette")
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 10, 10, 10)
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #1e222d;
-                border: 1px solid #333;
-                border-radius: 8px;
-            }
-            QLineEdit {
-                background: #2a3040;
-                color: white;
-                border: none;
-                padding: 10px;
-                font-size: 14px;
-                border-radius: 4px;
-            }
-            QListWidget {
-                background: transparent;
-                border: none;
-                color: #ddd;
-                font-size: 13px;
-            }
-            QListWidget::item {
-                padding: 8px;
-                border-radius: 4px;
-            }
-            QListWidget::item:selected {
-                background: #2cabf1;
-                color: white;
-            }
-        """)
         
         self.search = QLineEdit()
         self.search.setPlaceholderText("Type a command...")
-        self.search.textChanged.connect(self.filter_items)
+        # Coalesce bursts of keystrokes into a single filter pass
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(25)
+        self._debounce.timeout.connect(lambda: self.filter_items(self.search.text()))
+        self.search.textChanged.connect(lambda _t: self._debounce.start())
         self.search.returnPressed.connect(self.execute_selected)
         layout.addWidget(self.search)
         
@@ -216,27 +459,59 @@ class CommandPalette(QDialog):
         layout.addWidget(self.list_widget)
         
         self.populate()
-        
-        # Shadow
-        eff = QGraphicsDropShadowEffect(self)
-        eff.setBlurRadius(40)
-        eff.setColor(QColor(0, 0, 0, 120))
-        self.setGraphicsEffect(eff)
 
     def populate(self):
         self.list_widget.clear()
-        for name in self.actions_map:
-            self.list_widget.addItem(name)
+        self._items = []
+        for _, name in self._normalized:
+            item = QListWidgetItem(name)
+            self.list_widget.addItem(item)
+            self._items.append(item)
         self.list_widget.setCurrentRow(0)
 
     def filter_items(self, text):
-        self.list_widget.clear()
-        for name in self.actions_map:
-            if text.lower() in name.lower():
-                self.list_widget.addItem(name)
-        self.list_widget.setCurrentRow(0)
+        t = text.lower()
+        if not t:
+            matches = list(range(len(self._items)))
+        elif RAPIDFUZZ_AVAILABLE:
+            # Results come back best score first
+            results = process.extract(
+                t, self._choices, scorer=fuzz.WRatio, limit=20, score_cutoff=50
+            )
+            matches = [idx for _, _, idx in results]
+        else:
+            pattern = _subsequence_pattern(t)
+            matches = [i for i, low in enumerate(self._choices) if pattern.search(low)]
+        self.show_items(matches)
+
+    def show_items(self, indices):
+        # Reorder and hide the existing items instead of rebuilding the list
+        lw = self.list_widget
+        lw.setUpdatesEnabled(False)
+        for pos, idx in enumerate(indices):
+            item = self._items[idx]
+            row = lw.row(item)
+            if row != pos:
+                lw.insertItem(pos, lw.takeItem(row))
+            item.setHidden(False)
+        shown = set(indices)
+        for idx, item in enumerate(self._items):
+            if idx not in shown:
+                item.setHidden(True)
+        lw.setCurrentRow(0 if indices else -1)
+        lw.setUpdatesEnabled(True)
+
+    def reset(self):
+        # Called before a cached palette is shown again
+        self.search.clear()
+        self._debounce.stop()
+        self.filter_items("")
+        self.search.setFocus()
 
     def execute_selected(self):
+        if self._debounce.isActive():
+            self._debounce.stop()
+            self.filter_items(self.search.text())
         if self.list_widget.currentItem():
             name = self.list_widget.currentItem().text()
             func = self.actions_map.get(name)
@@ -250,6 +525,7 @@ SPEED_DIAL_HTML = """
 <!DOCTYPE html>
 <html>
 <head>
+    <title>New Tab</title>
     <style>
         body { background: #12151d; color: white; font-family: 'Segoe UI', sans-serif; display: flex; flex-direction: column; align-items: center; justify-content: center; height: 100vh; margin: 0; }
         h1 { font-size: 3rem; margin-bottom: 10px; background: linear-gradient(45deg, #2cabf1, #a68eff); -webkit-background-clip: text; -webkit-text-fill-color: transparent; }
@@ -262,7 +538,7 @@ SPEED_DIAL_HTML = """
 </head>
 <body>
     <h1>ZERON</h1>
-    <input type="text" class="search-box" placeholder="Search the web..." onkeypress="if(event.key==='Enter') window.location='https://google.com/search?q='+this.value">
+    <input type="text" class="search-box" placeholder="Search the web..." onkeypress="if(event.key==='Enter') window.location='https://www.google.com/search?q='+encodeURIComponent(this.value)">
     <div class="grid">
         <a class="card" href="https://youtube.com"><div class="icon">📺</div>YouTube</a>
         <a class="card" href="https://github.com"><div class="icon">🐙</div>GitHub</a>
@@ -277,29 +553,85 @@ SPEED_DIAL_HTML = """
 </html>
 """
 
+# Loaded as a data: URL so new tabs skip the setHtml round-trip. The QUrl
+# is built once too, so opening a tab does not re-convert and re-parse it.
+SPEED_DIAL_DATA_URL = (
+    "data:text/html;charset=utf-8;base64,"
+    + base64.b64encode(SPEED_DIAL_HTML.encode("utf-8")).decode("ascii")
+)
+SPEED_DIAL_QURL = QUrl(SPEED_DIAL_DATA_URL)
+
+def resolve_url(url):
+    if url in ("zeron://speeddial", SPEED_DIAL_DATA_URL):
+        return SPEED_DIAL_QURL
+    return QUrl(url)
+
 # ------------------ Main Window ------------------
 
 class ZeronMain(QMainWindow):
+    # SHORTCUT_SPECS with parsed QKeySequences, shared by every window
+    _shortcut_table = None
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("ZERON Browser")
         self.resize(1280, 800)
         self.setMinimumSize(800, 600)
+        self._current_browser = None
+        self._started = False
+        self._palette = None
         
-        # Setup Profile & AdBlock
-        self.profile = QWebEngineProfile.defaultProfile()
-        self.profile.setHttpUserAgent(LATEST_CHROMIUM_UA)
-        self.profile.setPersistentCookiesPolicy(QWebEngineProfile.ForcePersistentCookies)
-        self.profile.setCachePath(os.path.join(DATA_DIR, "cache"))
-        self.profile.setPersistentStoragePath(os.path.join(DATA_DIR, "cache"))
+        self.writer = JsonWriter(parent=self)
+        self.writer.start()
+
+        # History entries are buffered and appended to disk in batches
+        self._pending_history = []
+        self._history_timer = QTimer(self)
+        self._history_timer.setSingleShot(True)
+        self._history_timer.timeout.connect(self.flush_history)
+            
+        self.setup_ui()
+        # Opening the profile (cookie DB, cache index) and creating tabs is
+        # deferred to the first showEvent, see below
+        self._startup_scheduled = False
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._startup_scheduled:
+            # Queued behind the expose/paint events the show just posted, so
+            # the empty window gets on screen before the slow setup starts
+            self._startup_scheduled = True
+            QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        self.setup_profile()
         
         if SETTINGS.get("adblock_enabled"):
             self.adblocker = AdBlockInterceptor(self)
             self.profile.setUrlRequestInterceptor(self.adblocker)
             
-        self.setup_ui()
         self.setup_shortcuts()
         self.restore_session()
+        self._started = True
+
+    def setup_profile(self):
+        # Configured once on the shared default profile; every tab's page uses it
+        self.profile = QWebEngineProfile.defaultProfile()
+        self.profile.setHttpUserAgent(LATEST_CHROMIUM_UA)
+        self.profile.setPersistentCookiesPolicy(QWebEngineProfile.ForcePersistentCookies)
+        # Cookies and local storage stay where earlier versions put them
+        self.profile.setPersistentStoragePath(os.path.join(DATA_DIR, "cache"))
+        cache_dir = os.path.join(DATA_DIR, "httpcache")
+        remove_legacy_http_cache()
+        # Qt takes a C int here
+        cache_bytes = min(int_setting("http_cache_mb") * 1024 * 1024, 2**31 - 1)
+        if SETTINGS.get("http_cache_type") == "memory":
+            self.profile.setHttpCacheType(QWebEngineProfile.MemoryHttpCache)
+        else:
+            prepare_http_cache(cache_dir, cache_bytes)
+            self.profile.setCachePath(cache_dir)
+            self.profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+        self.profile.setHttpCacheMaximumSize(cache_bytes)
 
     def setup_ui(self):
         # Main Container
@@ -405,38 +737,70 @@ class ZeronMain(QMainWindow):
         self.progress_bar.setStyleSheet("QProgressBar { background: transparent; border: 0; } QProgressBar::chunk { background: #2cabf1; }")
         self.main_layout.addWidget(self.progress_bar)
         self.progress_bar.hide()
+        self._progress_visible = False
 
     def setup_shortcuts(self):
-        QShortcut(QKeySequence("Ctrl+T"), self, self.add_new_tab)
-        QShortcut(QKeySequence("Ctrl+W"), self, self.close_current_tab)
-        QShortcut(QKeySequence("Ctrl+R"), self, self.reload_page)
-        QShortcut(QKeySequence("Ctrl+L"), self, self.url_bar.setFocus)
-        QShortcut(QKeySequence("Ctrl+Shift+P"), self, self.show_command_palette)
-        QShortcut(QKeySequence("F11"), self, self.toggle_fullscreen)
+        # Key strings are parsed on first use, once the QApplication exists
+        if ZeronMain._shortcut_table is None:
+            ZeronMain._shortcut_table = [
+                (name, QKeySequence(keys), slot) for name, keys, slot in SHORTCUT_SPECS
+            ]
+        for name, seq, slot in self._shortcut_table:
+            action = QAction(name, self)
+            action.setShortcut(seq)
+            action.triggered.connect(getattr(self, slot))
+            self.addAction(action)
 
     # ------------------ Logic ------------------
 
-    def add_new_tab(self, url=None, label="New Tab"):
+    def add_new_tab(self, url=None, label="New Tab", defer=False):
         if not url:
             url = SETTINGS["home_page"]
         
+        # The view's default page already uses the configured default profile
         browser = QWebEngineView()
-        browser.setPage(QWebEnginePage(self.profile, browser))
         
-        if url == "zeron://speeddial":
-            browser.setHtml(SPEED_DIAL_HTML, QUrl("zeron://speeddial"))
+        if defer:
+            # Loaded by load_pending when the tab is first shown
+            browser.setProperty("pending_url", url)
         else:
-            browser.setUrl(QUrl(url))
+            browser.setUrl(resolve_url(url))
             
         i = self.tabs.addTab(browser, label)
-        self.tabs.setCurrentIndex(i)
+        if not defer:
+            self.tabs.setCurrentIndex(i)
         
-        browser.urlChanged.connect(lambda q, b=browser: self.update_url_bar(q, b))
+        self.connect_browser(browser)
+        return browser
+
+    def connect_browser(self, browser):
+        # Bound methods shared by every tab; the emitting view comes from sender()
+        browser.urlChanged.connect(self.on_url_changed)
         browser.loadProgress.connect(self.update_progress)
         browser.loadFinished.connect(self.on_load_finished)
-        browser.titleChanged.connect(lambda t, b=browser: self.update_tab_title(t, b))
-        
-        return browser
+        browser.titleChanged.connect(self.on_title_changed)
+
+    def on_url_changed(self, q):
+        self.update_url_bar(q, self.sender())
+        self.record_history(q.toString())
+
+    def record_history(self, url):
+        if not url or url.startswith(("about:", "data:")):
+            return
+        entry = {"url": url, "ts": time.time()}
+        HISTORY.append(entry)
+        self._pending_history.append(entry)
+        if not self._history_timer.isActive():
+            self._history_timer.start(2000)
+
+    def flush_history(self):
+        self._history_timer.stop()
+        if self._pending_history:
+            append_ndjson(HISTORY_FILE, self._pending_history)
+            self._pending_history = []
+
+    def on_title_changed(self, title):
+        self.update_tab_title(title, self.sender())
 
     def close_tab(self, index):
         if self.tabs.count() > 1:
@@ -451,23 +815,26 @@ class ZeronMain(QMainWindow):
         text = self.url_bar.text().strip()
         if not text: return
         
+        browser = self._current_browser
+        if browser is None: return
+        
         if text == "zeron://speeddial":
-            self.tabs.currentWidget().setHtml(SPEED_DIAL_HTML, QUrl("zeron://speeddial"))
+            browser.setUrl(SPEED_DIAL_QURL)
             return
 
-        if "." not in text and " " in text:
-            url = f"https://www.google.com/search?q={text}"
-        elif "." not in text:
-             url = f"https://www.google.com/search?q={text}"
+        if SCHEME_RE.match(text):
+            url = text
+        elif " " in text or "." not in text:
+            url = SEARCH_URL + quote_plus(text)
         else:
-            url = text if "://" in text else "https://" + text
+            url = "https://" + text
             
-        self.tabs.currentWidget().setUrl(QUrl(url))
+        browser.setUrl(QUrl(url))
 
     def update_url_bar(self, q, browser):
-        if browser != self.tabs.currentWidget(): return
+        if browser is not self._current_browser: return
         url = q.toString()
-        if url == "zeron://speeddial":
+        if url == SPEED_DIAL_DATA_URL:
             self.url_bar.setText("")
             self.url_bar.setPlaceholderText("Search or enter address")
         else:
@@ -480,32 +847,52 @@ class ZeronMain(QMainWindow):
             self.tabs.setTabText(index, title[:20] + "..." if len(title) > 20 else title)
 
     def on_tab_changed(self, index):
-        browser = self.tabs.widget(index)
+        browser = self._current_browser = self.tabs.widget(index)
+        self.set_progress_visible(False)
         if browser:
+            self.load_pending(browser)
             self.update_url_bar(browser.url(), browser)
 
+    def load_pending(self, browser):
+        url = browser.property("pending_url")
+        if url:
+            browser.setProperty("pending_url", None)
+            browser.setUrl(resolve_url(url))
+
     def update_progress(self, p):
-        self.progress_bar.setValue(p)
-        if 0 < p < 100:
-            self.progress_bar.show()
-        else:
-            self.progress_bar.hide()
+        # Background tabs keep loading but must not drive the shared bar
+        if self.sender() is not self._current_browser: return
+        loading = 0 < p < 100
+        if loading:
+            self.progress_bar.setValue(p)
+        self.set_progress_visible(loading)
 
     def on_load_finished(self):
-        self.progress_bar.hide()
+        if self.sender() is self._current_browser:
+            self.set_progress_visible(False)
+
+    def set_progress_visible(self, visible):
+        if visible != self._progress_visible:
+            self._progress_visible = visible
+            self.progress_bar.setVisible(visible)
 
     def go_back(self):
-        if self.tabs.currentWidget(): self.tabs.currentWidget().back()
+        if self._current_browser: self._current_browser.back()
 
     def go_forward(self):
-        if self.tabs.currentWidget(): self.tabs.currentWidget().forward()
+        if self._current_browser: self._current_browser.forward()
 
     def reload_page(self):
-        if self.tabs.currentWidget(): self.tabs.currentWidget().reload()
+        if self._current_browser: self._current_browser.reload()
 
     def go_home(self):
+        # A tab made before finish_startup would miss the profile setup
+        if not self._started: return
         self.add_new_tab()
 
+    def focus_url_bar(self):
+        self.url_bar.setFocus()
+
     def toggle_fullscreen(self):
         if self.isFullScreen():
             self.showNormal()
@@ -515,18 +902,25 @@ class ZeronMain(QMainWindow):
     # ------------------ Features ------------------
 
     def show_command_palette(self):
-        actions = {
-            "New Tab": self.add_new_tab,
-            "Close Tab": self.close_current_tab,
-            "Toggle Vertical Tabs": self.toggle_vertical_tabs,
-            "Toggle Fullscreen": self.toggle_fullscreen,
-            "Settings": self.open_settings,
-            "Downloads": self.open_downloads,
-            "History": self.open_history,
-            "Bookmarks": self.open_bookmarks,
-            "Exit Zeron": self.close
-        }
-        palette = CommandPalette(self, actions)
+        # Its "New Tab" action must not run before finish_startup either
+        if not self._started: return
+        # Built on first use and reused; only its filter state is reset
+        if self._palette is None:
+            actions = {
+                "New Tab": self.add_new_tab,
+                "Close Tab": self.close_current_tab,
+                "Toggle Vertical Tabs": self.toggle_vertical_tabs,
+                "Toggle Fullscreen": self.toggle_fullscreen,
+                "Settings": self.open_settings,
+                "Downloads": self.open_downloads,
+                "History": self.open_history,
+                "Bookmarks": self.open_bookmarks,
+                "Exit Zeron": self.close
+            }
+            self._palette = CommandPalette(self, actions)
+        else:
+            self._palette.reset()
+        palette = self._palette
         palette.move(self.geometry().center() - palette.rect().center())
         palette.exec_()
 
@@ -538,7 +932,7 @@ class ZeronMain(QMainWindow):
         else:
             self.tabs.setTabPosition(QTabWidget.North)
             SETTINGS["vertical_tabs"] = False
-        save_json(SETTINGS_FILE, SETTINGS)
+        self.writer.mark_dirty(SETTINGS_FILE, SETTINGS)
 
     def open_settings(self):
         QMessageBox.information(self, "Settings", "Settings Dialog Placeholder\n(Fully implemented in next update)")
@@ -555,27 +949,41 @@ class ZeronMain(QMainWindow):
     # ------------------ Session Management ------------------
 
     def save_session(self):
+        # Closing before startup finished must not overwrite the last session
+        if not self._started: return
         urls = []
         for i in range(self.tabs.count()):
             w = self.tabs.widget(i)
-            url = w.url().toString()
+            url = w.property("pending_url") or w.url().toString()
+            if url == SPEED_DIAL_DATA_URL:
+                url = "zeron://speeddial"
             if url: urls.append(url)
-        save_json(SESSION_FILE, {"urls": urls, "active_index": self.tabs.currentIndex()})
+        self.writer.mark_dirty(SESSION_FILE, {"urls": urls, "active_index": self.tabs.currentIndex()})
 
     def restore_session(self):
         data = load_json(SESSION_FILE, {})
         urls = data.get("urls", [])
         if urls:
+            # Only the active tab loads now; the rest load when first selected
+            self.tabs.blockSignals(True)
             for url in urls:
-                self.add_new_tab(url)
+                label = "New Tab" if url == "zeron://speeddial" else QUrl(url).host() or url
+                self.add_new_tab(url, label, defer=True)
             idx = data.get("active_index", 0)
             if idx < self.tabs.count():
                 self.tabs.setCurrentIndex(idx)
+            self.tabs.blockSignals(False)
+            self.on_tab_changed(self.tabs.currentIndex())
         else:
             self.add_new_tab()
 
     def closeEvent(self, event):
+        # History appends go out first; compaction and the snapshot then run
+        # on the writer thread alongside the session and any dirty settings
+        self.flush_history()
+        self.writer.queue_job(partial(compact_history, HISTORY.maxlen))
         self.save_session()
+        self.writer.stop()
         super().closeEvent(event)
 
 def main():
@@ -583,6 +991,16 @@ def main():
     os.environ["QT_AUTO_SCREEN_SCALE_FACTOR"] = "1"
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
+
+    # Chromium flags must be set before QApplication is created
+    flags = [
+        "--enable-gpu-rasterization", "--ignore-gpu-blocklist",
+        "--enable-zero-copy", "--num-raster-threads=4"
+    ]
+    if platform.system() == "Windows":
+        flags.append("--disable-gpu-compositing")
+    user_flags = os.environ.get("QTWEBENGINE_CHROMIUM_FLAGS", "")
+    os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = " ".join(flags + [user_flags]).strip()
     
     app = QApplication(sys.argv)
     app.setApplicationName("Zeron Browser")
@@ -603,6 +1021,7 @@ def main():
     palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
     palette.setColor(QPalette.HighlightedText, Qt.black)
     app.setPalette(palette)
+    app.setStyleSheet(APP_QSS)
     
     window = ZeronMain()
     window.show()